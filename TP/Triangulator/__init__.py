@@ -0,0 +1 @@
+"""Service Triangulator : triangulation, format binaire et API Flask."""
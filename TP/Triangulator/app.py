@@ -10,6 +10,8 @@ Architecture:
     - L'application utilise un stockage en mémoire (stub) pour les PointSets.
     - La triangulation est calculée via le module 'triangulator'.
     - Les données sont échangées en format binaire optimisé via 'binary_format'.
+    - Les encodages binaires d'un PointSet stocké sont calculés une seule fois,
+      au premier accès ou dès le POST si ``EAGER_TRIANGULATION`` est activé.
 
 Codes de réponse HTTP:
     - 200 OK: Requête réussie
@@ -42,45 +44,247 @@ Sécurité:
     - Gestion explicite des erreurs pour éviter les fuites d'information.
 """
 
+import argparse
+import json
+import os
+import re
 import struct
+import threading
+from concurrent.futures import Future
+from contextlib import suppress
+from functools import lru_cache
 
-from flask import Flask, jsonify, request
+from flask import Flask, request
 
 try:
     import triangulator
     from binary_format import (
-        binary_to_pointset,
         pointset_to_binary,
+        read_pointset,
         triangles_to_binary,
     )
 except ImportError:
     from . import triangulator
     from .binary_format import (
-        binary_to_pointset,
         pointset_to_binary,
+        read_pointset,
         triangles_to_binary,
     )
 
 app = Flask(__name__)
 """Flask: Application Flask pour le service Triangulator."""
 
+app.config.setdefault('EAGER_TRIANGULATION', False)
+"""bool: ``app.config['EAGER_TRIANGULATION']`` ; si vrai, POST /pointset calcule et met
+en cache la triangulation dès l'enregistrement : GET /triangulation/{id} ne fait
+plus qu'une copie mémoire."""
+
+MAX_PAYLOAD_SIZE = 50 * 1024 * 1024
+"""int: Taille maximale (en bytes) d'un PointSet reçu par POST /pointset."""
+
+_SAFE_ID_RE = re.compile(r'[A-Za-z0-9_-]{1,64}')
+"""re.Pattern: Forme autorisée d'un ID (lettres, chiffres, '-' et '_', 64 au plus)."""
+
+_inflight = {}
+"""dict: Triangulations en cours de calcul (ID -> Future), voir _coalesce."""
+_inflight_lock = threading.Lock()
+
 
 
 def _is_safe_id(pointset_id):
-    """Vérifie qu'un ID ne contient pas de caractères dangereux.
+    r"""Vérifie qu'un ID ne contient pas de caractères dangereux.
     
     Args:
         pointset_id (str): Identifiant à vérifier.
     
     Returns:
         bool: True si sûr, False sinon.
+    
+    Note:
+        Un seul passage de l'expression régulière précompilée : seuls
+        lettres, chiffres, '-' et '_' sont acceptés (les IDs générés,
+        hexadécimaux, en font partie), ce qui exclut '/', '\', '.' et les caractères de contrôle.
+        La longueur est bornée (64) dans la même expression : un ID démesuré
+        est rejeté sans être parcouru en entier ni cherché dans le stockage.
+
+    """
+    return _SAFE_ID_RE.fullmatch(pointset_id) is not None
+
+
+@lru_cache(maxsize=64)
+def _error_body(code, message):
+    """Encode une fois le corps JSON d'une erreur ``{"code": ..., "message": ...}``.
+    
+    Args:
+        code (str): Code d'erreur applicatif (ex. 'NOT_FOUND').
+        message (str): Message lisible associé.
+    
+    Returns:
+        bytes: Corps JSON compact, réutilisé pour les erreurs identiques.
+
+    """
+    return json.dumps({"code": code, "message": message}, separators=(',', ':')).encode()
+
+
+def _error(code, message, status):
+    """Construit une réponse d'erreur JSON sans passer par jsonify.
+    
+    Args:
+        code (str): Code d'erreur applicatif.
+        message (str): Message lisible associé.
+        status (int): Code de réponse HTTP.
+    
+    Returns:
+        flask.Response: Réponse ``application/json`` avec le corps mis en cache.
+    
+    Note:
+        Seul le corps est partagé entre requêtes : un objet Response est
+        mutable (en-têtes, hooks after_request) et reste donc créé à chaque
+        appel, pour quelques microsecondes.
+
+    """
+    return app.response_class(
+        response=_error_body(code, message),
+        status=status,
+        mimetype='application/json',
+    )
+
+
+def _binary_response(data):
+    """Construit une réponse 200 ``application/octet-stream`` sans copie du corps.
+    
+    Args:
+        data (bytes): Encodage binaire (PointSet ou Triangles), éventuellement
+            celui mis en cache sur le PointSet stocké.
+    
+    Returns:
+        flask.Response: Réponse dont le corps est l'objet ``data`` lui-même.
+    
+    Note:
+        werkzeug conserve un corps ``bytes`` tel quel (itérable à un élément)
+        et en déduit Content-Length : la réponse n'est jamais envoyée en
+        chunked et l'encodage mis en cache est écrit directement sur la socket.
+
+    """
+    return app.response_class(
+        response=data,
+        status=200,
+        mimetype='application/octet-stream',
+    )
+
+
+def _created_body(pointset_id):
+    """Encode le corps JSON ``{"pointSetId": ...}`` de la réponse 201.
+    
+    Un ID sûr (``[A-Za-z0-9_-]``, cas de tous les IDs du manager) ne
+    contient aucun caractère à échapper : le JSON est alors assemblé
+    directement, sans json.dumps. Tout autre ID passe par l'encodeur JSON.
+    
+    Args:
+        pointset_id (str): ID renvoyé par le manager.
+    
+    Returns:
+        bytes: Corps JSON compact.
+
+    """
+    if _is_safe_id(pointset_id):
+        return b'{"pointSetId":"' + pointset_id.encode() + b'"}'
+    return json.dumps({"pointSetId": pointset_id}, separators=(',', ':')).encode()
+
+
+def _remember(points, attr, value):
+    """Mémorise un encodage binaire sur le PointSet qui l'a produit.
+    
+    Seuls les PointSets du stockage (``triangulator.StoredPointSet``) ont
+    de la place pour ce cache ; pour toute autre séquence (ex. liste renvoyée
+    par un mock), l'encodage est simplement recalculé à chaque requête.
+    
+    Args:
+        points: PointSet renvoyé par le manager.
+        attr (str): Nom de l'encodage ('binary' ou 'triangulation_binary').
+        value (bytes): Encodage à mémoriser.
+
+    """
+    with suppress(AttributeError):
+        setattr(points, attr, value)
+
+
+def _coalesce(key, compute):
+    """Exécute ``compute`` une seule fois pour des appels simultanés sur ``key``.
+    
+    Le premier appel calcule ; ceux qui arrivent pendant le calcul attendent
+    son résultat (ou son exception) au lieu de refaire le même travail.
+    Une fois le calcul terminé, la clé est libérée.
+    
+    Args:
+        key (str): Clé du calcul (ID du PointSet).
+        compute (callable): Fonction sans argument, pure vis-à-vis de ``key``.
+    
+    Returns:
+        Le résultat de ``compute()``.
+    
+    Raises:
+        Exception: Toute exception levée par ``compute``, pour chaque appelant.
+
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+    
+    try:
+        result = compute()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def _precompute_triangulation(points):
+    """Calcule et mémorise la triangulation d'un PointSet dès son enregistrement.
+    
+    Un PointSet non triangulable (doublons, etc.) n'est pas mis en cache :
+    l'erreur reste signalée par GET /triangulation/{id}, comme en mode paresseux.
+    
+    Args:
+        points: PointSet décodé, tel que transmis au manager.
+
+    """
+    with suppress(ValueError, TypeError):
+        _triangulation_binary(points)
+
+
+def _triangulation_binary(points):
+    """Triangule un PointSet, encode le résultat et le mémorise sur le PointSet.
+    
+    Args:
+        points: PointSet renvoyé par le manager (ou décodé au POST).
+    
+    Returns:
+        bytes: Encodage au format Triangles.
+    
+    Raises:
+        ValueError: Si les points ne sont pas triangulables.
+        TypeError: Si le format des points est incorrect.
+        RuntimeError: Si la triangulation produite ne peut pas être encodée.
 
     """
-    if not pointset_id:
-        return False
-    if pointset_id.startswith("../") or pointset_id.startswith("..\\"):
-        return False
-    return not ("/" in pointset_id or "\\" in pointset_id)
+    triangles = triangulator.triangulate(points)
+    try:
+        result = triangles_to_binary(points, triangles)
+    except ValueError as e:
+        # Indices incohérents : erreur interne (500), pas une entrée invalide (400)
+        raise RuntimeError("Invalid triangulation result") from e
+    _remember(points, 'triangulation_binary', result)
+    return result
 
 
 @app.route('/triangulation/<pointset_id>', methods=['GET'])
@@ -91,7 +295,7 @@ def get_triangulation(pointset_id):
     et retourne le résultat encodé en format binaire.
     
     Args:
-        pointset_id (str): Identifiant unique du PointSet (UUID).
+        pointset_id (str): Identifiant unique du PointSet (32 caractères hexadécimaux).
     
     Returns:
         bytes: Données binaires contenant le PointSet original et ses triangles.
@@ -108,48 +312,37 @@ def get_triangulation(pointset_id):
     try:
         # Valider l'ID
         if not _is_safe_id(pointset_id):
-            return jsonify({"code": "INVALID_ID", "message": "Invalid ID format"}), 400
+            return _error("INVALID_ID", "Invalid ID format", 400)
         
         # Récupérer les points via le manager (mockable)
         try:
             points = triangulator.pointset_manager.get_pointset(pointset_id)
         except KeyError:
-            return jsonify({"code": "NOT_FOUND", "message": "PointSet not found"}), 404
+            return _error("NOT_FOUND", "PointSet not found", 404)
         
-        # Calculer la triangulation
-        try:
-            triangles = triangulator.triangulate(points)
-        except ValueError as e:
-            return jsonify(
-                {"code": "TRIANGULATION_FAILED", "message": str(e)}
-            ), 400
-        except TypeError as e:
-            return jsonify(
-                {"code": "TRIANGULATION_FAILED", "message": str(e)}
-            ), 400
-        except Exception:
-            return jsonify(
-                {"code": "TRIANGULATION_ERROR", "message": "Triangulation failed"}
-            ), 500
-        
-        # Convertir en format binaire
-        result_binary = triangles_to_binary(points, triangles)
+        # Triangulation déjà encodée pour ce PointSet ?
+        result_binary = getattr(points, 'triangulation_binary', None)
+        if result_binary is None:
+            # Calculer et encoder la triangulation (une seule fois pour des
+            # requêtes simultanées : les suivantes reçoivent le même encodage)
+            try:
+                result_binary = _coalesce(pointset_id, lambda: _triangulation_binary(points))
+            except ValueError as e:
+                return _error("TRIANGULATION_FAILED", str(e), 400)
+            except TypeError as e:
+                return _error("TRIANGULATION_FAILED", str(e), 400)
+            except Exception:
+                return _error("TRIANGULATION_ERROR", "Triangulation failed", 500)
         
-        return app.response_class(
-            response=result_binary, status=200, mimetype='application/octet-stream'
-        )
+        return _binary_response(result_binary)
     
     except TimeoutError:
-        return jsonify({"code": "TIMEOUT", "message": "Request timeout"}), 504
+        return _error("TIMEOUT", "Request timeout", 504)
     except ConnectionError:
-        return jsonify(
-            {"code": "SERVICE_UNAVAILABLE", "message": "Service unavailable"}
-        ), 503
+        return _error("SERVICE_UNAVAILABLE", "Service unavailable", 503)
 
     except Exception:
-        return jsonify(
-            {"code": "INTERNAL_ERROR", "message": "Internal server error"}
-        ), 500
+        return _error("INTERNAL_ERROR", "Internal server error", 500)
 
 
 @app.route('/pointset', methods=['POST'])
@@ -157,14 +350,14 @@ def store_pointset():
     """Enregistre un nouveau PointSet et retourne son ID unique.
     
     Reçoit les données binaires d'un PointSet, les valide et les stocke
-    en associant un identifiant unique UUID.
+    en associant un identifiant unique aléatoire (128 bits, en hexadécimal).
     
     Request:
         - Content-Type: application/octet-stream
         - Body: données binaires au format PointSet
     
     Returns:
-        dict: JSON avec le champ 'pointSetId' (UUID généré)
+        dict: JSON avec le champ 'pointSetId' (ID généré)
     
     Response Codes:
         - 201 Created: PointSet enregistré avec succès
@@ -174,36 +367,37 @@ def store_pointset():
 
     """
     try:
-        binary_data = request.get_data()
+        # Vérifier la taille annoncée avant toute lecture (limite à 50 MB)
+        content_length = request.content_length
+        if content_length is not None and content_length > MAX_PAYLOAD_SIZE:
+            return _error("PAYLOAD_TOO_LARGE", "Payload too large", 413)
         
         # Vérifier les données vides
-        if not binary_data or len(binary_data) == 0:
-            return jsonify({"code": "EMPTY_BODY", "message": "Empty request body"}), 400
-        
-        # Vérifier la taille (limite à 50 MB)
-        if len(binary_data) > 50 * 1024 * 1024:
-            return (
-                jsonify({"code": "PAYLOAD_TOO_LARGE", "message": "Payload too large"}),
-                413,
-            )
+        if content_length == 0:
+            return _error("EMPTY_BODY", "Empty request body", 400)
         
-        # Valider le format
+        # Lire et valider le format : les coordonnées sont lues depuis le flux
+        # directement dans le type stocké par le manager, sans tampon intermédiaire
+        max_size = MAX_PAYLOAD_SIZE if content_length is None else content_length
         try:
-            points = binary_to_pointset(binary_data)
+            points = read_pointset(request.stream, max_size, triangulator.StoredPointSet)
         except (ValueError, struct.error):
-            return jsonify(
-                {"code": "INVALID_FORMAT", "message": "Invalid binary format"}
-            ), 400
+            return _error("INVALID_FORMAT", "Invalid binary format", 400)
+        
+        if app.config['EAGER_TRIANGULATION']:
+            _precompute_triangulation(points)
         
         # Stocker via le manager (mockable)
         pointset_id = triangulator.pointset_manager.store_pointset(points)
         
-        return jsonify({"pointSetId": pointset_id}), 201
+        return app.response_class(
+            response=_created_body(pointset_id),
+            status=201,
+            mimetype='application/json',
+        )
     
     except Exception:
-        return jsonify(
-            {"code": "INTERNAL_ERROR", "message": "Internal server error"}
-        ), 500
+        return _error("INTERNAL_ERROR", "Internal server error", 500)
 
 
 @app.route('/pointset/<pointset_id>', methods=['GET'])
@@ -213,7 +407,7 @@ def get_pointset(pointset_id):
     Retourne les données binaires du PointSet stocké.
     
     Args:
-        pointset_id (str): Identifiant unique du PointSet (UUID).
+        pointset_id (str): Identifiant unique du PointSet (32 caractères hexadécimaux).
     
     Returns:
         bytes: Données binaires au format PointSet
@@ -228,23 +422,53 @@ def get_pointset(pointset_id):
     try:
         # Valider l'ID
         if not _is_safe_id(pointset_id):
-            return jsonify({"code": "INVALID_ID", "message": "Invalid ID format"}), 400
+            return _error("INVALID_ID", "Invalid ID format", 400)
         
         # Récupérer via le manager
         try:
             points = triangulator.pointset_manager.get_pointset(pointset_id)
-            binary_data = pointset_to_binary(points)
-            return app.response_class(
-                response=binary_data, status=200, mimetype='application/octet-stream'
-            )
+            binary_data = getattr(points, 'binary', None)
+            if binary_data is None:
+                binary_data = pointset_to_binary(points)
+                _remember(points, 'binary', binary_data)
+            return _binary_response(binary_data)
         except KeyError:
-            return jsonify({"code": "NOT_FOUND", "message": "PointSet not found"}), 404
+            return _error("NOT_FOUND", "PointSet not found", 404)
     
     except Exception:
-        return jsonify(
-            {"code": "INTERNAL_ERROR", "message": "Internal server error"}
-        ), 500
+        return _error("INTERNAL_ERROR", "Internal server error", 500)
+
+
+def main(argv=None):
+    """Lance le serveur Triangulator.
+    
+    Par défaut, l'application est servie par waitress si elle est installée
+    (serveur WSGI de production, un thread par cœur), sinon par le serveur
+    werkzeug en mode multi-thread. ``--debug`` revient au serveur de
+    développement avec rechargement automatique.
+    
+    Args:
+        argv (list): Arguments de la ligne de commande (sys.argv[1:] par défaut).
+
+    """
+    parser = argparse.ArgumentParser(description="Serveur Triangulator")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--debug', action='store_true',
+                        help="serveur de développement (rechargement, debugger)")
+    args = parser.parse_args(argv)
+    
+    if args.debug:
+        app.run(debug=True, host=args.host, port=args.port)
+        return
+    
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host=args.host, port=args.port, threaded=True)
+    else:
+        serve(app, host=args.host, port=args.port, threads=os.cpu_count() or 4)
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -31,8 +31,21 @@ Avantages du format binaire:
     - Compatible: little-endian universel
 """
 
-import math
 import struct
+import sys
+from array import array
+from itertools import chain
+
+# Formats fixes compilés une seule fois (évite l'analyse de la chaîne de format à chaque appel)
+_U32 = struct.Struct('<L')
+_FF = struct.Struct('<ff')
+_LLL = struct.Struct('<LLL')
+
+# Code de type array pour un entier non signé sur 4 bytes (indices de triangles)
+_INDEX_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+# Taille des blocs lus depuis un flux par read_pointset (borne le tampon de lecture)
+_READ_CHUNK = 64 * 1024
 
 
 def pointset_to_binary(points):
@@ -42,13 +55,19 @@ def pointset_to_binary(points):
     précédés du nombre de points sur 4 bytes.
     
     Args:
-        points (list): Liste de tuples ou listes (x, y).
+        points (list | array.array): Liste de tuples ou listes (x, y).
                       Chaque coordonnée est convertie en float.
+                      Accepte aussi un ``array('f')`` de coordonnées à plat
+                      (x0, y0, x1, y1, ...), recopié tel quel sans conversion.
     
     Returns:
         bytes: Données binaires au format PointSet.
               Taille: 4 + len(points) * 8 bytes
     
+    Raises:
+        ValueError: Si un point n'a pas exactement 2 coordonnées, ou si un
+                   tableau de coordonnées à plat a une longueur impaire.
+    
     Exemple::
     
         >>> binary = pointset_to_binary([(0, 0), (1, 0), (0.5, 1)])
@@ -58,25 +77,57 @@ def pointset_to_binary(points):
     Note:
         - Les coordonnées sont converties en float IEEE 754 (précision simple).
         - Format: little-endian pour compatibilité universelle.
-        - Pas de validation: utiliser binary_to_pointset pour valider.
+        - Encodage en un seul appel struct.pack (pas de concaténation par point).
+        - Seule la forme des points est vérifiée : utiliser binary_to_pointset
+          pour valider les valeurs.
 
     """
-    binary_data = struct.pack('<L', len(points))
-    for x, y in points:
-        binary_data += struct.pack('<ff', float(x), float(y))
-    return binary_data
+    if isinstance(points, array):
+        return _flat_array_to_binary(points)
+    # Un point à 1 ou 3 coordonnées décalerait toutes les coordonnées suivantes
+    if set(map(len, points)) - {2}:
+        raise ValueError("Each point must have exactly 2 coordinates")
+    num_points = len(points)
+    return struct.pack(f'<L{2 * num_points}f', num_points, *chain.from_iterable(points))
+
 
+def _flat_array_to_binary(coords):
+    """Encode un tableau de coordonnées à plat par simple copie mémoire.
+    
+    Args:
+        coords (array.array): Coordonnées (x0, y0, x1, y1, ...).
+    
+    Returns:
+        bytes: Données binaires au format PointSet.
+    
+    Raises:
+        ValueError: Si le nombre de coordonnées est impair.
 
-def binary_to_pointset(binary_data):
+    """
+    if len(coords) % 2:
+        raise ValueError("Flat coordinate array must have an even length")
+    if coords.typecode != 'f' or sys.byteorder != 'little':
+        coords = array('f', coords)
+        if sys.byteorder != 'little':
+            coords.byteswap()
+    return _U32.pack(len(coords) // 2) + coords.tobytes()
+
+
+def binary_to_pointset(binary_data, as_array=False):
     r"""Convertit des données binaires en liste de points.
     
     Décode le format PointSet et valide l'intégrité des données.
     
     Args:
-        binary_data (bytes): Données binaires au format PointSet.
+        binary_data (bytes | bytearray | memoryview): Données binaires au format PointSet.
+        as_array (bool | type): Si True, retourne un ``array('f')`` de coordonnées
+                         à plat (x0, y0, x1, y1, ...) au lieu d'une liste de tuples.
+                         Une sous-classe d'``array`` peut aussi être passée :
+                         le tableau est alors directement créé de ce type.
     
     Returns:
-        list: Liste de tuples (x, y) reconstruit.
+        list | array.array: Liste de tuples (x, y) reconstruit, ou tableau
+                            de coordonnées à plat si ``as_array`` est vrai.
     
     Raises:
         ValueError: Si les données sont trop courtes, tronquées ou invalides.
@@ -91,37 +142,135 @@ def binary_to_pointset(binary_data):
     Note:
         - Valide que la taille des données correspond au nombre de points.
         - Génère une erreur explicite en cas de données tronquées.
+        - Décodage en un seul passage (Struct.iter_unpack) sans copie du corps
+          ni de l'en-tête (Struct.unpack_from).
+        - NaN/Infinity rejetés avant tout décodage, par un balayage des bytes
+          bruts (cf. _has_non_finite).
+        - Avec ``as_array``, le corps est recopié d'un bloc dans un tableau
+          compact (8 bytes par point au lieu d'un tuple de deux floats).
 
     """
     if len(binary_data) < 4:
         raise ValueError("Binary data too short")
     
-    num_points = struct.unpack('<L', binary_data[:4])[0]
+    num_points = _U32.unpack_from(binary_data)[0]
     expected_size = 4 + (num_points * 8)
     
     if len(binary_data) < expected_size:
         raise ValueError("Binary data truncated")
     
-    points = []
-    offset = 4
-    for _ in range(num_points):
-        x, y = struct.unpack('<ff', binary_data[offset:offset+8])
-        if not math.isfinite(x) or not math.isfinite(y):
-            raise ValueError("NaN or Infinite value detected")
+    body = memoryview(binary_data)[4:expected_size]
+    if _has_non_finite(body):
+        raise ValueError("NaN or Infinite value detected")
+    
+    if as_array:
+        points = (as_array if isinstance(as_array, type) else array)('f')
+        points.frombytes(body)
+        if sys.byteorder != 'little':
+            points.byteswap()
+        return points
+    return list(_FF.iter_unpack(body))
+
 
-        points.append((x, y))
-        offset += 8
+def read_pointset(stream, max_size, array_type=array):
+    """Lit un PointSet depuis un flux, directement dans son tableau de coordonnées.
+    
+    Équivalent de ``binary_to_pointset(..., as_array=True)`` pour un corps de
+    requête : seul l'en-tête est lu à part, les coordonnées sont lues par
+    blocs de ``_READ_CHUNK`` bytes et ajoutées au tableau final au fil de
+    l'eau, sans tampon intermédiaire de la taille du corps.
+    
+    Args:
+        stream: Flux binaire lisible (``read`` et ``readinto``).
+        max_size (int): Nombre de bytes au plus disponibles dans le flux
+                        (ex. Content-Length) ; borne l'allocation.
+        array_type (type): ``array`` ou sous-classe à instancier.
+    
+    Returns:
+        array.array: Coordonnées à plat (x0, y0, x1, y1, ...).
+    
+    Raises:
+        ValueError: Si les données sont trop courtes, tronquées ou contiennent
+                   NaN/Infinity.
     
+    Note:
+        Les bytes éventuels au-delà des N points annoncés ne sont pas lus,
+        comme ils sont ignorés par binary_to_pointset.
+
+    """
+    header = stream.read(4)
+    if len(header) < 4:
+        raise ValueError("Binary data too short")
+    
+    num_points = _U32.unpack(header)[0]
+    expected_size = num_points * 8
+    if 4 + expected_size > max_size:
+        raise ValueError("Binary data truncated")
+    
+    points = array_type('f')
+    chunk = memoryview(bytearray(min(expected_size, _READ_CHUNK)))
+    remaining = expected_size
+    while remaining:
+        # Bloc rempli entièrement avant ajout : sa taille reste multiple de 8
+        block = chunk[:min(remaining, _READ_CHUNK)]
+        received = 0
+        while received < len(block):
+            count = stream.readinto(block[received:])
+            if not count:
+                raise ValueError("Binary data truncated")
+            received += count
+        points.frombytes(block)
+        remaining -= received
+    with memoryview(points).cast('B') as body:
+        if _has_non_finite(body):
+            raise ValueError("NaN or Infinite value detected")
+    
+    if sys.byteorder != 'little':
+        points.byteswap()
     return points
 
 
+def _has_non_finite(body):
+    """Détecte un NaN ou ±inf parmi des float32 little-endian, sans les décoder.
+    
+    Un float32 est non fini si et seulement si ses 8 bits d'exposant valent
+    tous 1. En little-endian, le 4e byte de chaque valeur porte le signe et
+    les 7 bits de poids fort de l'exposant : tant qu'aucun de ces bytes ne
+    vaut 0x7f ou 0xff, toutes les valeurs sont finies.
+    
+    Args:
+        body (memoryview): Suite de float32 little-endian.
+    
+    Returns:
+        bool: True si au moins une valeur vaut NaN ou ±inf.
+    
+    Note:
+        Le test rapide (extraction des bytes de poids fort puis recherche
+        ``in``) s'exécute entièrement en C ; seules les valeurs candidates,
+        de magnitude >= 2**127, sont examinées une à une. Seuls les bytes de
+        poids fort sont copiés (un quart du corps), via une vue à pas de 4.
+
+    """
+    raw = memoryview(body).cast('B')
+    high = raw[3::4].tobytes()
+    if b'\x7f' not in high and b'\xff' not in high:
+        return False
+    # Candidats : vérifier le dernier bit d'exposant (bit de poids fort du 3e byte)
+    return any(
+        raw[4 * i + 2] & 0x80
+        for i, byte in enumerate(high)
+        if byte & 0x7f == 0x7f
+    )
+
+
 def triangles_to_binary(points, triangles):
     """Convertit des points et triangles en format binaire compact.
     
     Combine le PointSet avec les indices des triangles dans un seul flux binaire.
     
     Args:
-        points (list): Liste de tuples (x, y) représentant les points.
+        points (list | array.array): Liste de tuples (x, y) représentant les points,
+                      ou ``array('f')`` de coordonnées à plat.
         triangles (list): Liste de tuples (i, j, k) où i, j, k sont les indices 
                          dans 'points' (0-based indexing).
     
@@ -143,20 +292,34 @@ def triangles_to_binary(points, triangles):
     Note:
         - Validation stricte: tous les indices doivent être valides.
         - Chaque triangle doit avoir exactement 3 sommets distincts.
+        - Les indices sont validés et encodés d'un bloc via un ``array('I')``.
+        - Le résultat est assemblé en une seule copie (``bytes.join``), sans
+          ``tobytes()`` ni concaténations intermédiaires.
 
     """
-    binary_data = pointset_to_binary(points)
-    binary_data += struct.pack('<L', len(triangles))
-    
-    for tri in triangles:
-        if len(tri) != 3:
-            raise ValueError("Triangle must have 3 vertices")
-        for idx in tri:
-            if not isinstance(idx, int) or idx < 0 or idx >= len(points):
-                raise ValueError(f"Index {idx} out of range")
-            binary_data += struct.pack('<L', idx)
-    
-    return binary_data
+    if any(len(tri) != 3 for tri in triangles):
+        raise ValueError("Triangle must have 3 vertices")
+    
+    num_points = len(points) // 2 if isinstance(points, array) else len(points)
+    indices = list(chain.from_iterable(triangles))
+    
+    # array('I') rejette d'emblée les non-entiers et les négatifs ; reste la borne haute
+    try:
+        packed = array(_INDEX_TYPECODE, indices)
+    except (TypeError, OverflowError):
+        packed = None
+    if packed is None or (indices and max(indices) >= num_points):
+        # Chemin d'erreur uniquement : retrouver le premier indice fautif
+        bad = next(
+            idx for idx in indices
+            if not isinstance(idx, int) or idx < 0 or idx >= num_points
+        )
+        raise ValueError(f"Index {bad} out of range")
+    
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    # Une seule allocation : join copie directement le tampon de l'array
+    return b''.join((pointset_to_binary(points), _U32.pack(len(triangles)), packed))
 
 
 def binary_to_triangles(binary_data):
@@ -188,40 +351,38 @@ def binary_to_triangles(binary_data):
     Note:
         - Validation bidirectionnelle complète.
         - Détecte les triangles avec sommet dupliqué.
+        - Décodage des indices en un seul passage (Struct.iter_unpack).
+        - Aucune copie : les en-têtes et les deux parties sont lus via memoryview.
         - Garantit la consistance entre les indices et le nombre de points.
 
     """
     if len(binary_data) < 4:
         raise ValueError("Binary data too short")
     
-    num_points = struct.unpack('<L', binary_data[:4])[0]
+    view = memoryview(binary_data)
+    num_points = _U32.unpack_from(view)[0]
     pointset_size = 4 + (num_points * 8)
     
     if len(binary_data) < pointset_size + 4:
         raise ValueError("Binary data truncated")
     
-    points = binary_to_pointset(binary_data[:pointset_size])
+    points = binary_to_pointset(view[:pointset_size])
     
-    num_triangles = struct.unpack('<L', binary_data[pointset_size:pointset_size+4])[0]
+    num_triangles = _U32.unpack_from(view, pointset_size)[0]
     expected_size = pointset_size + 4 + (num_triangles * 12)
     
     if len(binary_data) < expected_size:
         raise ValueError("Binary data truncated")
     
-    triangles = []
-    offset = pointset_size + 4
-    
-    for _ in range(num_triangles):
-        idx1, idx2, idx3 = struct.unpack('<LLL', binary_data[offset:offset+12])
-        
-        for idx in [idx1, idx2, idx3]:
-            if idx >= len(points):
-                raise ValueError(f"Index {idx} out of range")
-        
-        if len(set([idx1, idx2, idx3])) != 3:
-            raise ValueError("Triangle has duplicate vertices")
-        
-        triangles.append((idx1, idx2, idx3))
-        offset += 12
+    body = view[pointset_size + 4:expected_size]
+    triangles = list(_LLL.iter_unpack(body))
+    
+    if triangles:
+        max_idx = max(chain.from_iterable(triangles))
+        if max_idx >= len(points):
+            raise ValueError(f"Index {max_idx} out of range")
+    
+    if any(i in (j, k) or j == k for i, j, k in triangles):
+        raise ValueError("Triangle has duplicate vertices")
     
     return points, triangles
@@ -1,8 +1,11 @@
 """Benchmark script for Triangulator."""
+import argparse
 import os
 import random
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -12,34 +15,69 @@ except ImportError as e:
     print(f"Erreur d'import: {e}")
     sys.exit(1)
 
-def generate_random_points(n):
-    """Génére n points aléatoires."""
-    return [(random.uniform(0, 10000), random.uniform(0, 10000)) for _ in range(n)]
+BENCHMARK_SEED = 0
 
-def run_benchmark():
-    """Benchmark avec different nombre de points."""
+def generate_random_points(n, seed=None):
+    """Génére n points aléatoires (reproductibles si seed est fourni)."""
+    # random() lié et mis à l'échelle : ~2x plus rapide que 2n appels à random.uniform
+    rnd = random.Random(seed).random
+    return [(rnd() * 10000.0, rnd() * 10000.0) for _ in repeat(None, n)]
+
+def time_triangulation(points):
+    """Mesure un appel à triangulate, retourne (durée en s, triangles)."""
+    start_time = time.perf_counter()
+    triangles = triangulate(points)
+    return time.perf_counter() - start_time, triangles
+
+def bench_size(n, repeats):
+    """Mesure triangulate sur n points, retourne (à froid, à chaud, nb triangles).
+
+    La graine fixe rend chaque tirage préfixe du même tirage de référence,
+    quel que soit le processus qui l'exécute.
+    """
+    points = generate_random_points(n, seed=BENCHMARK_SEED)
+    cold, triangles = time_triangulation(points)
+    warm = min(time_triangulation(points)[0] for _ in range(repeats))
+    return cold, warm, len(triangles)
+
+def print_result(n, future):
+    """Affiche la ligne du tableau pour une taille, ou l'erreur rencontrée."""
+    try:
+        cold, warm, num_triangles = future.result()
+        print(f"{n:<10} | {cold:<12.4f} | {warm:<12.4f} | {num_triangles:<10}")
+    except Exception as e:
+        print(f"{n:<10} | {'FAILED':<12} | {'':<12} | {str(e)}")
+
+def run_benchmark(repeats=3, parallel=False):
+    """Benchmark avec different nombre de points.
+
+    Chaque taille est mesurée dans un processus neuf (GC, allocateur et caches
+    non hérités des mesures précédentes). Le premier appel (à froid) est mesuré
+    à part ; la colonne « à chaud » retient le meilleur de ``repeats`` appels.
+    Avec ``parallel``, toutes les tailles tournent en même temps.
+    """
     sizes = [100, 1000, 5000, 10000, 50000, 100000]
     
     print("\n Benchmark Triangulator ")
-    print("=" * 45)
-    print(f"{'Points':<10} | {'Time (s)':<12} | {'Triangles':<10}")
-    print("-" * 45)
+    print("=" * 52)
+    print(f"{'Points':<10} | {'Cold (s)':<12} | {'Warm (s)':<12} | {'Triangles':<10}")
+    print("-" * 52)
     
-    for n in sizes:
-        print(f"Generating {n} points...", end='\r')
-        points = generate_random_points(n)
-        
-        start_time = time.time()
-        try:
-            triangles = triangulate(points)
-            end_time = time.time()
-            duration = end_time - start_time
-            print(f"{n:<10} | {duration:<12.4f} | {len(triangles):<10}")
-        except Exception as e:
-            print(f"{n:<10} | {'FAILED':<12} | {str(e)}")
-
-    print("=" * 45)
+    if parallel:
+        with ProcessPoolExecutor() as executor:
+            futures = [executor.submit(bench_size, n, repeats) for n in sizes]
+            for n, future in zip(sizes, futures, strict=True):
+                print_result(n, future)
+    else:
+        for n in sizes:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                print_result(n, executor.submit(bench_size, n, repeats))
+
+    print("=" * 52)
     print("Benchmark terminé.\n")
 
 if __name__ == "__main__":
-    run_benchmark()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--parallel', action='store_true',
+                        help="mesurer toutes les tailles en parallèle")
+    run_benchmark(parallel=parser.parse_args().parallel)
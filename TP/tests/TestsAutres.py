@@ -1,5 +1,6 @@
 """Tests de cas limites."""
 import pytest
+from Triangulator.triangulator import triangulate
 
 
 class TestEdgeCases:
@@ -7,8 +8,6 @@ class TestEdgeCases:
     
     def test_single_point(self):
         """Test: Un seul point."""
-        from triangulator import triangulate
-        
         points = [(0.0, 0.0)]
         
         with pytest.raises(ValueError):
@@ -16,8 +15,6 @@ class TestEdgeCases:
     
     def test_two_points(self):
         """Test: Deux points."""
-        from triangulator import triangulate
-        
         points = [(0.0, 0.0), (1.0, 1.0)]
         
         with pytest.raises(ValueError):
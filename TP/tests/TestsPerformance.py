@@ -1,8 +1,9 @@
 """Module for performance tests."""
 import time
-from unittest.mock import Mock, patch
 
 import pytest
+from Triangulator.binary_format import binary_to_pointset, pointset_to_binary
+from Triangulator.triangulator import triangulate
 
 
 @pytest.mark.performance
@@ -11,8 +12,6 @@ class TestPerformance:
     
     def test_large_pointset_triangulation(self, large_pointset):
         """Test: Triangulation d'un grand nombre de points."""
-        from Triangulator.triangulator import triangulate
-        
         start_time = time.time()
         triangles = triangulate(large_pointset)
         end_time = time.time()
@@ -21,32 +20,40 @@ class TestPerformance:
         assert execution_time < 5.0, f"Triangulation took {execution_time}s, expected < 5s"
         assert len(triangles) > 0
     
-    def test_repeated_requests_performance(self, client):
+    def test_repeated_requests_performance(self, client, patched_pm):
         """Test: Requêtes répétées."""
-        mock_pm = Mock()
         test_points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
-        mock_pm.get_pointset.return_value = test_points
+        patched_pm.get_pointset.return_value = test_points
         
         num_requests = 100
         times = []
         
-        with patch('triangulator.pointset_manager', mock_pm):
-            for _ in range(num_requests):
-                start = time.time()
-                response = client.get('/triangulation/test-id')
-                times.append(time.time() - start)
-                assert response.status_code == 200
+        for _ in range(num_requests):
+            start = time.time()
+            response = client.get('/triangulation/test-id')
+            times.append(time.time() - start)
+            assert response.status_code == 200
         
         avg_time = sum(times) / len(times)
         assert avg_time < 0.1, f"Average time {avg_time}s, expected < 0.1s"
     
+    def test_repeated_requests_cached(self, client, large_pointset):
+        """Test: Requêtes répétées sur un PointSet stocké -> servies depuis le cache."""
+        post = client.post('/pointset', data=pointset_to_binary(large_pointset))
+        pointset_id = post.get_json()['pointSetId']
+        client.get(f'/triangulation/{pointset_id}')
+        
+        start = time.time()
+        for _ in range(100):
+            client.get(f'/triangulation/{pointset_id}')
+        avg_time = (time.time() - start) / 100
+        
+        assert avg_time < 0.01, f"Average cached time {avg_time}s, expected < 0.01s"
+    
     @pytest.mark.performance
     def test_memory_usage(self, large_pointset):
         """Test: Mesure de l'utilisation de lamémoire."""
         import tracemalloc
-
-        from Triangulator.triangulator import triangulate
-        
         tracemalloc.start()
         
         _ = triangulate(large_pointset)
@@ -60,8 +67,6 @@ class TestPerformance:
     @pytest.mark.performance
     def test_binary_conversion_performance(self, large_pointset):
         """Test: Performance des conversions binaires."""
-        from Triangulator.binary_format import binary_to_pointset, pointset_to_binary
-        
         # Conversion vers binaire
         start = time.time()
         binary_data = pointset_to_binary(large_pointset)
@@ -1,9 +1,11 @@
 """Robustness tests module."""
 import random
 import struct
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 import pytest
+from Triangulator.binary_format import binary_to_pointset, triangles_to_binary
+from Triangulator.triangulator import triangulate
 
 
 class TestRobustness:
@@ -18,8 +20,6 @@ class TestRobustness:
     
     def test_non_float_coordinates(self):
         """Test: Coordonnées non float (NaN) -> 400."""
-        from Triangulator.binary_format import binary_to_pointset
-        
         # Binary data with NaN in one coordinate
         # Count = 1 (4 bytes), then NaN and 0.0 (8 bytes)
         invalid_data = struct.pack('<L', 1) + struct.pack('<ff', float('nan'), 0.0)
@@ -27,51 +27,41 @@ class TestRobustness:
         with pytest.raises((ValueError, struct.error)):
             binary_to_pointset(invalid_data)
     
-    def test_unreachable_service(self, client):
+    def test_unreachable_service(self, client, monkeypatch, mock_pointset_manager_unavailable):
         """Test: Service injoignable -> 503."""
-        with patch('triangulator.pointset_manager') as mock_pm:
-            mock_pm.get_pointset.side_effect = ConnectionError()
-            
-            response = client.get('/triangulation/test-id')
-            assert response.status_code == 503
+        monkeypatch.setattr('Triangulator.triangulator.pointset_manager', mock_pointset_manager_unavailable)
+        
+        response = client.get('/triangulation/test-id')
+        assert response.status_code == 503
     
-    def test_empty_result(self, client):
+    def test_empty_result(self, client, patched_pm):
         """Test: Résultat vide -> message clair."""
-        mock_pm = Mock()
-        mock_pm.get_pointset.return_value = [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)]  # Collinear
-        
-        with patch('triangulator.pointset_manager', mock_pm):
-            response = client.get('/triangulation/test-id')
-            
-            # Peut être 200 avec résultat vide ou 400 avec message
-            assert response.status_code in [200, 400]
+        patched_pm.get_pointset.return_value = [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)]  # Collinear
+        
+        response = client.get('/triangulation/test-id')
+        
+        # Peut être 200 avec résultat vide ou 400 avec message
+        assert response.status_code in [200, 400]
     
-    def test_internal_exception_handling(self, client):
+    def test_internal_exception_handling(self, client, patched_pm, monkeypatch):
         """Test: Exceptions -> 500."""
         # Mock pointset_manager to ensure points are found (avoids 404)
-        mock_pm = Mock()
-        mock_pm.get_pointset.return_value = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]
-
-        with patch('triangulator.triangulate') as mock_tri, \
-             patch('triangulator.pointset_manager', mock_pm):
-            mock_tri.side_effect = RuntimeError("Unexpected error")
-            
-            response = client.get('/triangulation/test-id')
-            assert response.status_code == 500
+        patched_pm.get_pointset.return_value = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]
+        monkeypatch.setattr('Triangulator.triangulator.triangulate', Mock(side_effect=RuntimeError("Unexpected error")))
+        
+        response = client.get('/triangulation/test-id')
+        assert response.status_code == 500
     
-    def test_timeout_handling(self, client):
+    def test_timeout_handling(self, client, monkeypatch, mock_pointset_manager_with_timeout):
         """Test: Timeout -> 504."""
-        with patch('triangulator.pointset_manager') as mock_pm:
-            mock_pm.get_pointset.side_effect = TimeoutError()
-            
-            response = client.get('/triangulation/test-id')
-            assert response.status_code == 504
+        monkeypatch.setattr('Triangulator.triangulator.pointset_manager', mock_pointset_manager_with_timeout)
+        
+        response = client.get('/triangulation/test-id')
+        assert response.status_code == 504
     
     
     def test_negative_coordinates_robustness(self):
         """Test: Points avec coordonnées négatives."""
-        from Triangulator.triangulator import triangulate
-        
         points = [
             (-100.0, -200.0),
             (-50.0, -100.0),
@@ -84,8 +74,6 @@ class TestRobustness:
     
     def test_beyond_float_limits(self):
         """Test: Valeurs au-delà des limites float."""
-        from Triangulator.triangulator import triangulate
-        
         # Très grandes valeurs mais encore dans les limites
         points = [
             (1e30, 1e30),
@@ -101,8 +89,6 @@ class TestRobustness:
     
     def test_random_corrupted_data(self):
         """Test: Données aléatoires/corrompues."""
-        from Triangulator.binary_format import binary_to_pointset
-        
         # Générer données aléatoires
         corrupted = bytes(random.getrandbits(8) for _ in range(20))
         
@@ -112,8 +98,6 @@ class TestRobustness:
     
     def test_pointset_with_single_point(self):
         """Test: PointSet avec un seul point."""
-        from Triangulator.triangulator import triangulate
-        
         points = [(0.0, 0.0)]
         
         with pytest.raises(ValueError) as exc_info:
@@ -124,8 +108,6 @@ class TestRobustness:
     
     def test_pointset_with_two_points(self):
         """Test: PointSet avec deux points."""
-        from Triangulator.triangulator import triangulate
-        
         points = [(0.0, 0.0), (1.0, 1.0)]
         
         with pytest.raises(ValueError) as exc_info:
@@ -134,27 +116,22 @@ class TestRobustness:
         assert "insufficient" in str(exc_info.value).lower() or \
                "moins" in str(exc_info.value).lower()
     
-    def test_database_connection_failure(self, client):
+    def test_database_connection_failure(self, client, patched_pm):
         """Test: Défaillance  base de données."""
-        with patch('triangulator.pointset_manager') as mock_pm:
-            mock_pm.get_pointset.side_effect = ConnectionError("DB connection lost")
-            
-            response = client.get('/triangulation/test-id')
-            assert response.status_code == 503
+        patched_pm.get_pointset.side_effect = ConnectionError("DB connection lost")
+        
+        response = client.get('/triangulation/test-id')
+        assert response.status_code == 503
     
-    def test_pointset_format_mismatch(self, client):
+    def test_pointset_format_mismatch(self, client, patched_pm):
         """Test: Format PointSet inattendu."""
-        mock_pm = Mock()
-        mock_pm.get_pointset.return_value = {"invalid": "format"}  # Dict au lieu de list
+        patched_pm.get_pointset.return_value = {"invalid": "format"}  # Dict au lieu de list
         
-        with patch('triangulator.pointset_manager', mock_pm):
-            response = client.get('/triangulation/test-id')
-            assert response.status_code in [400, 500]
+        response = client.get('/triangulation/test-id')
+        assert response.status_code in [400, 500]
     
     def test_triangle_with_out_of_range_indices(self):
         """Test: Triangle avec indices hors limites."""
-        from Triangulator.binary_format import triangles_to_binary
-        
         points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
         
         # indice invalide
@@ -1,4 +1,9 @@
 """Routes tests module."""
+from unittest.mock import Mock
+
+import pytest
+from Triangulator import triangulator
+from Triangulator.app import MAX_PAYLOAD_SIZE
 from Triangulator.binary_format import pointset_to_binary
 
 
@@ -31,6 +36,46 @@ class TestTriangulationEndpoint:
         response = client.get('/triangulation/../../etc/passwd')
         assert response.status_code in [400, 404]
     
+    def test_triangulation_cached(self, client, sample_binary):
+        """Test: Requêtes répétées -> encodage calculé une fois puis réutilisé."""
+        pointset_id = client.post('/pointset', data=sample_binary).get_json()['pointSetId']
+        
+        first = client.get(f'/triangulation/{pointset_id}')
+        second = client.get(f'/triangulation/{pointset_id}')
+        
+        assert first.status_code == second.status_code == 200
+        assert first.data == second.data
+        assert second.content_length == len(second.data)
+        stored = triangulator.pointset_manager.get_pointset(pointset_id)
+        assert stored.triangulation_binary == first.data
+    
+    def test_repeated_requests_triangulate_once(self, client, monkeypatch, large_pointset):
+        """Test: Requêtes répétées sur un PointSet stocké -> une seule triangulation."""
+        spy = Mock(wraps=triangulator.triangulate)
+        monkeypatch.setattr(triangulator, 'triangulate', spy)
+        
+        post = client.post('/pointset', data=pointset_to_binary(large_pointset))
+        pointset_id = post.get_json()['pointSetId']
+        responses = [client.get(f'/triangulation/{pointset_id}') for _ in range(100)]
+        
+        assert spy.call_count == 1
+        assert all(r.status_code == 200 for r in responses)
+        assert len({r.data for r in responses}) == 1
+    
+    def test_eager_triangulation(self, client, flask_app, monkeypatch, large_pointset):
+        """Test: EAGER_TRIANGULATION -> triangulation calculée au POST, GET sans calcul."""
+        monkeypatch.setitem(flask_app.config, 'EAGER_TRIANGULATION', True)
+        spy = Mock(wraps=triangulator.triangulate)
+        monkeypatch.setattr(triangulator, 'triangulate', spy)
+        
+        post = client.post('/pointset', data=pointset_to_binary(large_pointset))
+        assert post.status_code == 201
+        assert spy.call_count == 1
+        
+        response = client.get(f"/triangulation/{post.get_json()['pointSetId']}")
+        assert response.status_code == 200
+        assert spy.call_count == 1
+    
     def test_triangulation_collinear(self, client):
         """Test: Points colinéaires -> liste vide."""
         # Points colinéaires
@@ -47,15 +92,25 @@ class TestTriangulationEndpoint:
 class TestErrorHandling:
     """Tests gestion erreurs HTTP."""
     
-    def test_400_bad_request(self, client):
-        """Test: Code 400 pour requête invalide."""
-        response = client.post('/pointset', data=b'invalid binary data')
-        assert response.status_code == 400
-    
-    def test_404_not_found(self, client):
-        """Test: Code 404 pour ressource non trouvée."""
-        response = client.get('/pointset/nonexistent-id')
-        assert response.status_code == 404
+    @pytest.mark.parametrize(
+        ("method", "route", "data", "exc", "expected"),
+        [
+            ('POST', '/pointset', b'invalid binary data', None, 400),
+            ('GET', '/pointset/nonexistent-id', None, None, 404),
+            ('GET', '/triangulation/test-id', None, Exception("Unexpected"), 500),
+            ('GET', '/triangulation/test-id', None, ConnectionError(), 503),
+        ],
+        ids=['400', '404', '500', '503'],
+    )
+    def test_error_codes(self, request, client, method, route, data, exc, expected):
+        """Test: Codes 400, 404, 500 et 503 selon la requête et l'état du PointSetManager."""
+        if exc is not None:
+            request.getfixturevalue('patched_pm').get_pointset.side_effect = exc
+        
+        response = client.open(route, method=method, data=data)
+        assert response.status_code == expected
+        assert response.mimetype == 'application/json'
+        assert set(response.get_json()) == {'code', 'message'}
 
 
 class TestPointSetRegistration:
@@ -71,11 +126,31 @@ class TestPointSetRegistration:
         assert response.status_code == 201
         assert 'pointSetId' in response.json
     
+    @pytest.mark.parametrize("pointset_id", ["id-123", 'id"with\\quotes'])
+    def test_post_pointset_response_json(self, client, patched_pm, sample_binary, pointset_id):
+        """Test: Corps 201 -> JSON valide, y compris pour un ID à échapper."""
+        patched_pm.store_pointset.return_value = pointset_id
+        
+        response = client.post('/pointset', data=sample_binary)
+        
+        assert response.status_code == 201
+        assert response.content_type == 'application/json'
+        assert response.get_json() == {"pointSetId": pointset_id}
+    
     def test_post_pointset_invalid_format(self, client):
         """Test: POST /pointset avec format invalide -> 400."""
         response = client.post('/pointset', data=b'invalid data')
         assert response.status_code == 400
     
+    def test_post_pointset_announced_too_large(self, client):
+        """Test: Content-Length au-delà de la limite -> 413 sans lire le corps."""
+        response = client.post(
+            '/pointset',
+            data=b'\x00' * 8,
+            environ_overrides={'CONTENT_LENGTH': str(MAX_PAYLOAD_SIZE + 1)},
+        )
+        assert response.status_code == 413
+    
     def test_post_pointset_empty(self, client):
         """Test: POST /pointset avec données vides -> 400."""
         response = client.post('/pointset', data=b'')
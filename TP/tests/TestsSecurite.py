@@ -2,52 +2,67 @@
 import struct
 
 import pytest
+from Triangulator import triangulator
+from Triangulator.app import _is_safe_id
+from Triangulator.binary_format import binary_to_pointset
+
+#exemple d'id trafiqués (traversée, injection SQL, XSS, octet nul)
+MALICIOUS_IDS = [
+    "../../../etc/passwd",
+    "'; DROP TABLE pointsets; --",
+    "<script>alert('xss')</script>",
+    "id%00.txt",
+    "1' OR '1'='1",
+    "..%2f..%2fetc",
+    "id\x00",
+]
 
 
 class TestSecurity:
     """Tests de sécurité."""
     
-    def test_tampered_id(self, client):
+    @pytest.mark.parametrize("malicious_id", MALICIOUS_IDS)
+    def test_tampered_id(self, client, malicious_id):
         """Test: ID trafiqué."""
-        #exemple d'id trafiqués
-        malicious_ids = [
-            "../../../etc/passwd",
-            "'; DROP TABLE pointsets; --",
-            "<script>alert('xss')</script>",
-            "id%00.txt"
-        ]
-        
-        for malicious_id in malicious_ids:
-            response = client.get(f'/triangulation/{malicious_id}')
-            assert response.status_code in [400, 404]
+        response = client.get(f'/triangulation/{malicious_id}')
+        assert response.status_code in [400, 404]
+    
+    @pytest.mark.parametrize("malicious_id", MALICIOUS_IDS)
+    def test_tampered_id_rejected_by_validator(self, malicious_id):
+        """Test: ID trafiqué -> refusé par le filtre d'admission, avant tout accès au stockage."""
+        assert not _is_safe_id(malicious_id)
+    
+    def test_generated_ids_accepted(self):
+        """Test: IDs générés par le manager (aléatoires ou séquentiels) -> acceptés."""
+        for manager in (triangulator.PointSetManager(), triangulator.PointSetManager(sequential_ids=True)):
+            assert _is_safe_id(manager.store_pointset([(0.0, 0.0)]))
     
-    def test_oversized_request_dos(self, client):
-        """Test: Requêtes surdimensionnées (DoS simulé)."""
-        huge_data = b'\xFF' * (10 * 1024 * 1024)  # 10 MB
+    def test_overlong_id(self, client):
+        """Test: ID au-delà de 64 caractères -> 400 sur les deux routes GET."""
+        for route in ('/triangulation/', '/pointset/'):
+            assert client.get(route + 'a' * 64).status_code == 404
+            assert client.get(route + 'a' * 65).status_code == 400
+    
+    def test_oversized_request_dos(self, client, oversized_request_stream):
+        """Test: Requêtes surdimensionnées (DoS simulé) -> rejet sans lire le corps."""
+        stream = oversized_request_stream  # 10 MB annoncés, générés à la lecture
         
-        response = client.post('/pointset', data=huge_data)
+        response = client.post('/pointset', input_stream=stream)
         # Devrait rejeter ou gérer gracieusement
         assert response.status_code in [400, 413, 405]
+        assert stream.consumed < 1024
     
-    def test_sql_injection_in_id(self, client):
-        """Test: Injection SQL dans l'ID."""
-        sql_injection = "1' OR '1'='1"
-        
-        response = client.get(f'/triangulation/{sql_injection}')
-        assert response.status_code in [400, 404]
+    def test_oversized_binary_pointset(self, client, oversized_pointset_stream):
+        """Test: PointSet trop volumineux -> rejet dès l'en-tête."""
+        # Prétendre avoir bien plus de points que le corps n'en contient
+        stream = oversized_pointset_stream
         
-    def test_oversized_binary_pointset(self, client):
-        """Test: PointSet trop volumineux."""
-        # Prétendre avoir 1 million de points
-        huge_header = b'\x00\x0c\x42\x6f' + b'\x00' * (1000 * 1000)
-        
-        response = client.post('/pointset', data=huge_header)
+        response = client.post('/pointset', input_stream=stream)
         assert response.status_code in [400, 413]
+        assert stream.consumed < 1024
     
     def test_command_injection_in_pointset_data(self):
         """Test: Injection de commande dans données PointSet."""
-        from Triangulator.binary_format import binary_to_pointset
-        
         # Injecter des commandes shell
         shell_commands = b'; rm -rf / #'
         
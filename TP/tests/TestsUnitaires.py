@@ -1,7 +1,23 @@
 """Module containing unit tests for triangulation and binary conversion."""
+import io
 import struct
+from array import array
+from itertools import chain
 
 import pytest
+from Triangulator.binary_format import (
+    binary_to_pointset,
+    binary_to_triangles,
+    pointset_to_binary,
+    read_pointset,
+    triangles_to_binary,
+)
+from Triangulator.triangulator import (
+    PointSetManager,
+    StoredPointSet,
+    triangulate,
+    triangulate_soa,
+)
 
 
 class TestTriangulationAlgorithm:
@@ -9,8 +25,6 @@ class TestTriangulationAlgorithm:
     
     def test_three_points_one_triangle(self, sample_points):
         """Test: 3 points -> 1 triangle correct."""
-        from Triangulator.triangulator import triangulate
-        
         triangles = triangulate(sample_points)
         
         assert len(triangles) == 1
@@ -19,8 +33,6 @@ class TestTriangulationAlgorithm:
     
     def test_four_points_square_two_triangles(self, square_points):
         """Test: 4 points formant un carré -> 2 triangles."""
-        from Triangulator.triangulator import triangulate
-        
         triangles = triangulate(square_points)
         
         assert len(triangles) == 2
@@ -29,16 +41,43 @@ class TestTriangulationAlgorithm:
     
     def test_collinear_points_no_triangle(self, collinear_points):
         """Test: Points alignés -> aucun triangle."""
-        from Triangulator.triangulator import triangulate
-        
         triangles = triangulate(collinear_points)
         
         assert len(triangles) == 0
     
+    def test_mixed_tuple_and_list_points(self):
+        """Test: Points tuples et listes mélangés -> même triangulation que des tuples."""
+        points = [(0.0, 0.0), [1.0, 0.0], (0.5, 1.0), [2.0, 2.0]]
+        
+        assert triangulate(points) == triangulate([tuple(p) for p in points]) == [(0, 2, 1), (0, 1, 3)]
+    
+    def test_collinear_points_skip_sort(self, monkeypatch):
+        """Test: Grand ensemble aligné -> vide sans tri ; doublon aligné -> toujours rejeté."""
+        monkeypatch.setattr('Triangulator.triangulator.triangulation', pytest.fail)
+        points = [(float(i), 2.0 * i) for i in range(10000)]
+        
+        assert triangulate(points) == []
+        with pytest.raises(ValueError):
+            triangulate(points + [(0.0, 0.0)])
+    
+    @pytest.mark.parametrize("offset, expected", [
+        (1e-11, "Duplicate"),
+        (4e-11, "Duplicate"),
+        (1.6e-10, [(0, 1, 2)]),  # assez proche pour le préfiltre, arrondis distincts
+        (2e-10, [(0, 1, 2)]),  # exactement au seuil du préfiltre
+        (1e-3, [(0, 1, 2)]),
+    ])
+    def test_three_points_near_duplicate(self, offset, expected):
+        """Test: 3 points dont deux très proches -> même critère d'arrondi (1e-10) que le cas général."""
+        points = [(0.0, 0.0), (offset, 0.0), (0.0, 1.0)]
+        if expected == "Duplicate":
+            with pytest.raises(ValueError, match="Duplicate"):
+                triangulate(points)
+        else:
+            assert triangulate(points) == expected
+    
     def test_duplicate_points_rejection(self):
         """Test: Points dupliqués -> rejet ou fusion."""
-        from Triangulator.triangulator import triangulate
-        
         points = [
             (0.0, 0.0),
             (1.0, 0.0),
@@ -59,8 +98,6 @@ class TestTriangulationAlgorithm:
     
     def test_invalid_input_format(self):
         """Test: Format d'entrée invalide -> exceptions gérées."""
-        from Triangulator.triangulator import triangulate
-        
         with pytest.raises((TypeError, ValueError)):
             triangulate("invalid")
         
@@ -72,48 +109,32 @@ class TestTriangulationAlgorithm:
     
     def test_empty_pointset(self):
         """Test: PointSet vide -> renvoyer une erreur."""
-        from Triangulator.triangulator import triangulate
-        
         with pytest.raises(ValueError) as exc_info:
             triangulate([])
         
         assert "empty" in str(exc_info.value).lower() or "vide" in str(exc_info.value).lower()
     
-    def test_points_with_nan(self):
-        """Test: Points avec NaN -> rejeter."""
-        from Triangulator.triangulator import triangulate
-        
-        points = [
-            (0.0, 0.0),
-            (float('nan'), 0.0),
-            (0.5, 1.0)
-        ]
-        
-        with pytest.raises(ValueError) as exc_info:
-            triangulate(points)
-        
-        assert "nan" in str(exc_info.value).lower() or "invalid" in str(exc_info.value).lower()
-    
-    def test_points_with_inf(self):
-        """Test: Points avec inf -> rejeter."""
-        from Triangulator.triangulator import triangulate
-        
+    @pytest.mark.parametrize(
+        ("value", "keyword"),
+        [(float('nan'), "nan"), (float('inf'), "inf")],
+        ids=['nan', 'inf'],
+    )
+    def test_points_with_non_finite(self, value, keyword):
+        """Test: Points avec NaN ou inf -> rejeter."""
         points = [
             (0.0, 0.0),
-            (float('inf'), 0.0),
+            (value, 0.0),
             (0.5, 1.0)
         ]
         
         with pytest.raises(ValueError) as exc_info:
             triangulate(points)
         
-        assert "inf" in str(exc_info.value).lower() or "invalid" in str(exc_info.value).lower()
+        assert keyword in str(exc_info.value).lower() or "invalid" in str(exc_info.value).lower()
     
     
     def test_very_large_coordinates(self):
         """Test: Points avec très grandes coordonnées ->overflow potentiel."""
-        from Triangulator.triangulator import triangulate
-        
         points = [
             (1e6, 1e6),
             (1e6 + 1, 1e6),
@@ -126,8 +147,6 @@ class TestTriangulationAlgorithm:
     
     def test_very_close_points_precision(self, very_close_points):
         """Test: Points très proches."""
-        from Triangulator.triangulator import triangulate
-        
         # Points séparés de 1e-8 peuvent causer des problèmes de précision
         try:
             triangles = triangulate(very_close_points)
@@ -140,8 +159,6 @@ class TestTriangulationAlgorithm:
     
     def test_large_number_of_points_1000(self, large_pointset_1000):
         """Test: Triangulation avec 1000 points."""
-        from Triangulator.triangulator import triangulate
-        
         triangles = triangulate(large_pointset_1000)
         
         # Vérifie qu'on a des triangles
@@ -151,10 +168,34 @@ class TestTriangulationAlgorithm:
         for triangle in triangles:
             assert all(0 <= idx < len(large_pointset_1000) for idx in triangle)
     
+    def test_flat_array_input(self, sample_points, square_points):
+        """Test: array('f') à plat (format de stockage) -> même triangulation que la liste."""
+        for points in (sample_points, square_points):
+            coords = array('f', chain.from_iterable(points))
+            assert triangulate(coords) == triangulate(points)
+    
+    @pytest.mark.parametrize("coords, message", [
+        ([0, 0, 1, 0, float('nan'), 1, 2, 2], "NaN"),
+        ([0, 0, 1, 0, 0, 1, float('-inf'), 2], "Infinity"),
+        ([0, 0, 1, 0, 0, 1, 1, 0], "Duplicate"),
+        ([0, 0, 1, 0, 0], "even length"),
+        ([0], "even length"),
+        ([0, 0, 1, 0], "Insufficient"),
+    ])
+    def test_flat_array_invalid(self, coords, message):
+        """Test: array('f') invalide -> mêmes erreurs que le format liste."""
+        with pytest.raises(ValueError, match=message):
+            triangulate(array('f', coords))
+    
+    def test_soa_input(self, square_points):
+        """Test: colonnes x / y séparées -> même triangulation ; longueurs différentes -> erreur."""
+        xs, ys = (array('f', column) for column in zip(*square_points, strict=True))
+        assert triangulate_soa(xs, ys) == triangulate(square_points)
+        with pytest.raises(ValueError):
+            triangulate_soa(xs, ys[:-1])
+    
     def test_negative_coordinates(self):
         """Test: Points avec coordonnées négatives."""
-        from Triangulator.triangulator import triangulate
-        
         points = [
             (-1.0, -1.0),
             (1.0, -1.0),
@@ -165,149 +206,229 @@ class TestTriangulationAlgorithm:
         assert len(triangles) == 1
 
 
+class TestPointSetManager:
+    """Tests unitaires du stockage des PointSets."""
+    
+    @pytest.mark.parametrize("sequential_ids", [False, True], ids=['random', 'sequential'])
+    def test_store_and_get(self, sample_points, sequential_ids):
+        """Test: IDs distincts et sûrs, points relus à l'identique."""
+        manager = PointSetManager(sequential_ids=sequential_ids)
+        
+        ids = [manager.store_pointset(sample_points) for _ in range(3)]
+        
+        assert len(set(ids)) == 3
+        assert all(pointset_id.isalnum() for pointset_id in ids)
+        assert list(manager.get_pointset(ids[0])) == list(chain.from_iterable(sample_points))
+        with pytest.raises(KeyError):
+            manager.get_pointset('missing')
+    
+    @pytest.mark.parametrize("points", [
+        [(0.0, 0.0), (1.0,), (0.5, 1.0)],
+        [(0.0, 0.0), (1.0, 0.0, 2.0), (0.5,)],
+        array('f', [0.0, 0.0, 1.0]),
+    ], ids=['short', 'misaligned', 'odd-flat'])
+    def test_store_rejects_malformed_points(self, points):
+        """Test: Point sans exactement 2 coordonnées -> rejeté dès le stockage."""
+        with pytest.raises(ValueError):
+            PointSetManager().store_pointset(points)
+    
+    def test_store_flat_double_array(self):
+        """Test: array('d') à plat -> converti en array('f') au stockage."""
+        manager = PointSetManager()
+        pointset_id = manager.store_pointset(array('d', [0.0, 0.0, 1.0, 0.0, 0.5, 1.0]))
+        assert list(manager.get_pointset(pointset_id)) == [0.0, 0.0, 1.0, 0.0, 0.5, 1.0]
+    
+    def test_deduplicate(self, sample_points, square_points):
+        """Test: Contenus identiques -> IDs distincts, un seul tableau partagé."""
+        manager = PointSetManager(deduplicate=True)
+        
+        first, second, other = (
+            manager.store_pointset(points)
+            for points in (sample_points, list(sample_points), square_points)
+        )
+        
+        assert first != second
+        assert manager.get_pointset(first) is manager.get_pointset(second)
+        assert manager.get_pointset(other) is not manager.get_pointset(first)
+
+
 class TestBinaryConversions:
     """Tests unitaires des conversions binaires."""
     
     def test_pointset_to_binary(self, sample_points):
         """Test: PointSet -> flux binaire conforme."""
-        from Triangulator.binary_format import pointset_to_binary
-        
         binary_data = pointset_to_binary(sample_points)
         
         # Vérifie les 4 premiers bytes (nombre de points)
-        num_points = struct.unpack('<L', binary_data[:4])[0]
+        num_points = int.from_bytes(binary_data[:4], 'little')
         assert num_points == 3
         
         # Vérifie la taille totale
         expected_size = 4 + (3 * 8)  # 4 bytes header + 3 points * 8 bytes
         assert len(binary_data) == expected_size
         
-        # Vérifier chaque point
-        offset = 4
-        for _, (x, y) in enumerate(sample_points):
-            x_bytes = binary_data[offset:offset+4]
-            y_bytes = binary_data[offset+4:offset+8]
-            
-            x_decoded = struct.unpack('<f', x_bytes)[0]
-            y_decoded = struct.unpack('<f', y_bytes)[0]
-            
-            assert abs(x_decoded - x) < 1e-6
-            assert abs(y_decoded - y) < 1e-6
-            
-            offset += 8
-    
-    def test_binary_to_pointset(self, sample_points):
-        """Test: flux binaire -> PointSet, points identiques à l'original."""
-        from Triangulator.binary_format import binary_to_pointset, pointset_to_binary
+        # Vérifier tous les points en un seul décodage
+        decoded = list(struct.iter_unpack('<ff', binary_data[4:]))
+        assert list(chain.from_iterable(decoded)) == pytest.approx(
+            list(chain.from_iterable(sample_points)), abs=1e-6
+        )
+    
+    @pytest.mark.parametrize("points", [
+        [(0.0, 0.0, 1.0), (2.0,)],
+        [(0.0, 0.0, 1.0), (2.0, 3.0)],
+        [(0.0, 0.0), (1.0,)],
+    ], ids=['misaligned', 'extra', 'short'])
+    def test_pointset_to_binary_malformed_points(self, points):
+        """Test: Point sans exactement 2 coordonnées -> ValueError, rien n'est encodé."""
+        with pytest.raises(ValueError, match="exactly 2 coordinates"):
+            pointset_to_binary(points)
+    
+    def test_pointset_to_binary_from_flat_array(self, sample_points, sample_binary):
+        """Test: array('f') de coordonnées à plat -> même flux binaire qu'une liste."""
+        coords = array('f', chain.from_iterable(sample_points))
         
-        binary_data = pointset_to_binary(sample_points)
-        decoded_points = binary_to_pointset(binary_data)
+        assert pointset_to_binary(coords) == sample_binary
         
-        assert len(decoded_points) == len(sample_points)
+        with pytest.raises(ValueError):
+            pointset_to_binary(array('f', [0.0, 1.0, 2.0]))
+    
+    def test_binary_to_pointset(self, sample_points, sample_binary):
+        """Test: flux binaire -> PointSet, points identiques à l'original."""
+        decoded_points = binary_to_pointset(sample_binary)
         
-        for original, decoded in zip(sample_points, decoded_points, strict=True):
-            assert abs(original[0] - decoded[0]) < 1e-6
-            assert abs(original[1] - decoded[1]) < 1e-6
+        assert len(decoded_points) == len(sample_points)
+        assert list(chain.from_iterable(decoded_points)) == pytest.approx(
+            list(chain.from_iterable(sample_points)), abs=1e-6
+        )
     
-    def test_triangles_to_binary(self, sample_points):
+    def test_binary_to_pointset_as_array(self, sample_points, sample_binary):
+        """Test: flux binaire -> array('f') à plat, réencodé à l'identique."""
+        coords = binary_to_pointset(sample_binary, as_array=True)
+        
+        assert isinstance(coords, array)
+        assert list(coords) == pytest.approx(list(chain.from_iterable(sample_points)), abs=1e-6)
+        assert pointset_to_binary(coords) == sample_binary
+        assert type(binary_to_pointset(sample_binary, as_array=StoredPointSet)) is StoredPointSet
+        
+        non_finite = sample_binary[:4] + struct.pack('<6f', 0, 0, float('nan'), 0, 0.5, 1)
+        with pytest.raises(ValueError):
+            binary_to_pointset(non_finite, as_array=True)
+    
+    def test_read_pointset_from_stream(self, sample_points, sample_binary):
+        """Test: lecture d'un flux -> tableau à plat ; flux tronqué ou NaN -> rejet."""
+        coords = read_pointset(io.BytesIO(sample_binary), len(sample_binary), StoredPointSet)
+        
+        assert type(coords) is StoredPointSet
+        assert pointset_to_binary(coords) == sample_binary
+        
+        with pytest.raises(ValueError, match="truncated"):
+            read_pointset(io.BytesIO(sample_binary[:-1]), len(sample_binary))
+        with pytest.raises(ValueError, match="truncated"):
+            read_pointset(io.BytesIO(sample_binary), len(sample_binary) - 1)
+        with pytest.raises(ValueError, match="NaN"):
+            read_pointset(io.BytesIO(struct.pack('<L2f', 1, 0.0, float('nan'))), 12)
+    
+    def test_triangles_to_binary(self, sample_triangles_binary):
         """Test: Triangles -> flux binaire conforme."""
-        from Triangulator.binary_format import triangles_to_binary
-        
-        triangles = [(0, 1, 2)]
-        binary_data = triangles_to_binary(sample_points, triangles)
+        binary_data = sample_triangles_binary
         
         # Partie 1: PointSet
-        num_points = struct.unpack('<L', binary_data[:4])[0]
+        num_points = int.from_bytes(binary_data[:4], 'little')
         assert num_points == 3
         
         pointset_size = 4 + (3 * 8)
         
         # Partie 2: Triangles
-        num_triangles = struct.unpack('<L', binary_data[pointset_size:pointset_size+4])[0]
+        num_triangles = int.from_bytes(binary_data[pointset_size:pointset_size+4], 'little')
         assert num_triangles == 1
         
         # Vérifier les indices du triangle
-        offset = pointset_size + 4
-        for i in range(3):
-            idx = struct.unpack('<L', binary_data[offset:offset+4])[0]
-            assert idx == i
-            offset += 4
+        assert list(struct.iter_unpack('<LLL', binary_data[pointset_size+4:])) == [(0, 1, 2)]
     
-    def test_binary_to_triangles(self, sample_points):
+    def test_binary_to_triangles(self, sample_triangles_binary):
         """Test: flux binaire -> Triangles, triangles identiques à l'original."""
-        from Triangulator.binary_format import binary_to_triangles, triangles_to_binary
-        
         original_triangles = [(0, 1, 2)]
-        binary_data = triangles_to_binary(sample_points, original_triangles)
-        
-        decoded_points, decoded_triangles = binary_to_triangles(binary_data)
+        decoded_points, decoded_triangles = binary_to_triangles(sample_triangles_binary)
         
         assert len(decoded_triangles) == len(original_triangles)
         assert decoded_triangles[0] == original_triangles[0]
     
-    def test_no_duplicate_vertex_in_triangle(self, sample_points):
+    def test_no_duplicate_vertex_in_triangle(self, sample_triangles_binary):
         """Test: Vérifier qu'il n'y a pas plusieurs fois le même sommet pour un triangle."""
-        from Triangulator.binary_format import binary_to_triangles, triangles_to_binary
-        
-        triangles = [(0, 1, 2)]
-        binary_data = triangles_to_binary(sample_points, triangles)
-        _, decoded_triangles = binary_to_triangles(binary_data)
+        _, decoded_triangles = binary_to_triangles(sample_triangles_binary)
         
         for triangle in decoded_triangles:
             assert len(set(triangle)) == 3, "Triangle has duplicate vertices"
     
-    def test_binary_size_verification(self, sample_points):
+    def test_binary_to_triangles_rejects_invalid_indices(self, sample_binary):
+        """Test: flux binaire avec sommet dupliqué ou indice hors limites -> rejet."""
+        duplicated = sample_binary + struct.pack('<L3L', 1, 0, 0, 1)
+        out_of_range = sample_binary + struct.pack('<L3L', 1, 0, 1, 3)
+        
+        with pytest.raises(ValueError, match="duplicate"):
+            binary_to_triangles(duplicated)
+        with pytest.raises(ValueError, match="out of range"):
+            binary_to_triangles(out_of_range)
+    
+    @pytest.mark.parametrize("triangle", [(0, 1, 3), (0, -1, 2), (0, 1.0, 2)],
+                             ids=['too-large', 'negative', 'float'])
+    def test_triangles_to_binary_rejects_invalid_indices(self, sample_points, triangle):
+        """Test: indice hors limites, négatif ou non entier -> rejet à l'encodage."""
+        with pytest.raises(ValueError, match="out of range"):
+            triangles_to_binary(sample_points, [(0, 1, 2), triangle])
+    
+    def test_binary_size_verification(self, sample_points, sample_binary, sample_triangles_binary):
         """Test: Vérification de la taille et du nombre de bytes."""
-        from Triangulator.binary_format import pointset_to_binary, triangles_to_binary
-        
         # PointSet
-        ps_binary = pointset_to_binary(sample_points)
         expected_ps_size = 4 + len(sample_points) * 8
-        assert len(ps_binary) == expected_ps_size
+        assert len(sample_binary) == expected_ps_size
         
         # Triangles
         triangles = [(0, 1, 2)]
-        tr_binary = triangles_to_binary(sample_points, triangles)
         expected_tr_size = expected_ps_size + 4 + len(triangles) * 12
-        assert len(tr_binary) == expected_tr_size
+        assert len(sample_triangles_binary) == expected_tr_size
     
     
-    def test_binary_with_negative_coordinates(self):
-        """Test: Conversion binaire avec coordonnées négatives."""
-        from Triangulator.binary_format import binary_to_pointset, pointset_to_binary
-        
-        points = [
-            (-1.5, -2.5),
-            (3.0, -1.0),
-            (-0.5, 4.5)
-        ]
-        
-        binary_data = pointset_to_binary(points)
-        decoded = binary_to_pointset(binary_data)
-        
-        for original, decoded_pt in zip(points, decoded, strict=True):
-            assert abs(original[0] - decoded_pt[0]) < 1e-6
-            assert abs(original[1] - decoded_pt[1]) < 1e-6
+    @pytest.mark.parametrize("pointset_fixture", [
+        "sample_points",
+        "square_points",
+        "collinear_points",
+        "negative_coordinates_points",
+        "large_pointset_1000",
+        "extreme_pointset",
+    ])
+    def test_binary_roundtrip(self, request, pointset_fixture):
+        """Test: PointSet -> binaire -> PointSet, pour chaque forme de jeu de points."""
+        points = request.getfixturevalue(pointset_fixture)
+        
+        decoded = binary_to_pointset(pointset_to_binary(points))
+        
+        assert len(decoded) == len(points)
+        # Tolérance relative: les coordonnées sont stockées en float32
+        assert list(chain.from_iterable(decoded)) == pytest.approx(
+            list(chain.from_iterable(points)), rel=1e-6, abs=1e-6
+        )
     
-    def test_binary_with_large_pointset(self, large_pointset_1000):
-        """Test: Conversion binaire avec 1000 points."""
-        from Triangulator.binary_format import binary_to_pointset, pointset_to_binary
-        
-        binary_data = pointset_to_binary(large_pointset_1000)
-        decoded = binary_to_pointset(binary_data)
-        
-        assert len(decoded) == len(large_pointset_1000)
-        
-        # Vérification avec quelques points aléatoires
-        # Tolérance 1e-4 pour erreurs d'arrondi float64 en struct.pack/unpack
-        for i in [0, 100, 500, 999]:
-            assert abs(large_pointset_1000[i][0] - decoded[i][0]) < 1e-4
-            assert abs(large_pointset_1000[i][1] - decoded[i][1]) < 1e-4
+    @pytest.mark.parametrize(("value", "finite"), [
+        (float('nan'), False),
+        (float('inf'), False),
+        (float('-inf'), False),
+        (3.4e38, True),
+        (-3.4e38, True),
+        (1e-45, True),
+    ], ids=['nan', 'inf', '-inf', 'max', '-max', 'subnormal'])
+    def test_binary_to_pointset_finiteness(self, value, finite):
+        """Test: NaN/inf rejetés, grands flottants finis et subnormaux acceptés."""
+        binary_data = struct.pack('<L4f', 2, 0.0, 1.0, value, 2.0)
+        
+        if finite:
+            assert len(binary_to_pointset(binary_data)) == 2
+        else:
+            with pytest.raises(ValueError):
+                binary_to_pointset(binary_data)
     
     def test_binary_corrupted_data(self):
         """Test: Données binaires corrompues -> exceptions."""
-        from Triangulator.binary_format import binary_to_pointset
-        
         # Données trop courtes
         corrupted = b'\x05\x00\x00\x00'
         
@@ -316,8 +437,6 @@ class TestBinaryConversions:
     
     def test_binary_zero_points(self):
         """Test: Conversion binaire avec 0 points."""
-        from Triangulator.binary_format import binary_to_pointset, pointset_to_binary
-        
         points = []
         binary_data = pointset_to_binary(points)
         
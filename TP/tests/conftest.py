@@ -1,15 +1,13 @@
-"""Configuration pytest et fixtures globales."""
-import os
-import sys
+"""Configuration pytest et fixtures globales.
 
-# Ajouter les répertoires au path pour les imports
-tests_dir = os.path.dirname(os.path.abspath(__file__))
-tp_dir = os.path.dirname(tests_dir)
-triangulator_dir = os.path.join(tp_dir, 'Triangulator')
+Le package ``Triangulator`` est importable grâce à ``pythonpath = ["TP"]``
+(configuration pytest de pyproject.toml) : aucun chemin ajouté ici.
+"""
+import os
 
-sys.path.insert(0, tests_dir)
-sys.path.insert(0, tp_dir)
-sys.path.insert(0, triangulator_dir)
+# Les sous-processus lancés par les tests ne doivent pas réinitialiser coverage
+os.environ.pop('COVERAGE_PROCESS_START', None)
+os.environ.pop('COVERAGE_PROCESS_CONFIG', None)
 
 
 
@@ -18,5 +16,8 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "performance: mark test as performance test (deselect with '-m \"not performance\"')"
     )
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run grouped tests on the same pytest-xdist worker"
+    )
 
 from .mocks import *  # noqa: E402, F403
\ No newline at end of file
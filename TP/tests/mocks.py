@@ -1,10 +1,92 @@
 """Module defining mocks for tests."""
+import io
+import random
+import struct
 from unittest.mock import Mock
 
 import pytest
 
+_MOCK_DB_BLOB = (
+    b'\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x80?\x00\x00\x00\x00\x00\x00\x00?\x00\x00\x80?'
+)
+"""bytes: PointSet binaire renvoyé par mock_database (constante partagée, immuable)."""
 
-@pytest.fixture
+_CORRUPTED_BLOB = b'\xFF\xFF\xFF\xFF' + b'\x00' * 100
+"""bytes: En-tête annonçant 2**32 - 1 points suivi de 100 octets nuls."""
+
+
+class FakePointSetManager:
+    """Stub minimal du PointSetManager, plus léger qu'un Mock.
+
+    Args:
+        points (list): Points renvoyés par get_pointset.
+        error (Exception): Exception levée par get_pointset à la place.
+
+    """
+
+    def __init__(self, points=None, error=None):
+        """Initialise le stub."""
+        self.points = points
+        self.error = error
+
+    def get_pointset(self, pointset_id):
+        """Renvoie les points (ou lève l'erreur configurée)."""
+        if self.error is not None:
+            raise self.error
+        return self.points
+
+    def store_pointset(self, points):
+        """Simule l'enregistrement et renvoie un ID fixe."""
+        return "test-id-123"
+
+
+class RepeatingStream(io.RawIOBase):
+    """Corps de requête de ``size`` octets identiques, généré à la lecture.
+
+    Args:
+        size (int): Taille totale annoncée du corps.
+        fill (int): Valeur de chaque octet.
+        prefix (bytes): Octets servis avant le remplissage (ex. un en-tête).
+
+    Attributes:
+        consumed (int): Nombre d'octets effectivement lus par le serveur.
+
+    """
+
+    def __init__(self, size, fill=0xFF, prefix=b''):
+        """Initialise le flux sans allouer le corps."""
+        super().__init__()
+        self.size = size
+        self.fill = fill
+        self.prefix = prefix
+        self.position = 0
+        self.consumed = 0
+
+    def readable(self):
+        """Le flux est lisible."""
+        return True
+
+    def seekable(self):
+        """Le client de test mesure le corps par seek/tell."""
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Déplace la position de lecture (sans rien lire)."""
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = base + offset
+        return self.position
+
+    def readinto(self, buffer):
+        """Remplit ``buffer`` avec les octets suivants et compte la lecture."""
+        n = max(0, min(len(buffer), self.size - self.position))
+        head = self.prefix[self.position:self.position + n]
+        buffer[:n] = head + bytes([self.fill]) * (n - len(head))
+        self.position += n
+        self.consumed += n
+        return n
+
+
+@pytest.fixture(scope="session")
 def sample_points():
     """Mock fournissant un ensemble de points."""
     return [
@@ -13,7 +95,21 @@ def sample_points():
         (0.5, 1.0)
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_binary(sample_points):
+    """Mock: sample_points encodé une seule fois au format PointSet."""
+    from Triangulator.binary_format import pointset_to_binary
+
+    return pointset_to_binary(sample_points)
+
+@pytest.fixture(scope="session")
+def sample_triangles_binary(sample_points):
+    """Mock: sample_points et le triangle (0, 1, 2) encodés une seule fois."""
+    from Triangulator.binary_format import triangles_to_binary
+
+    return triangles_to_binary(sample_points, [(0, 1, 2)])
+
+@pytest.fixture(scope="session")
 def square_points():
     """Mock fournissant 4 points formant un carré."""
     return [
@@ -23,7 +119,7 @@ def square_points():
         (0.0, 1.0)
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def collinear_points():
     """Mock fournissant des points alignés."""
     return [
@@ -32,7 +128,7 @@ def collinear_points():
         (2.0, 0.0)
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def large_pointset():
     """Mock fournissant un grand ensemble de points pour tests de performance."""
     points = []
@@ -43,19 +139,14 @@ def large_pointset():
     return points
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def large_pointset_1000():
     """Mock: 1000 points."""
-    import random
-    random.seed(42)
-    points = []
-    for _ in range(1000):
-        x = random.uniform(-1000.0, 1000.0)
-        y = random.uniform(-1000.0, 1000.0)
-        points.append((x, y))
-    return points
+    # générateur local : même séquence que random.seed(42) sans toucher à l'état global
+    uniform = random.Random(42).uniform
+    return [(uniform(-1000.0, 1000.0), uniform(-1000.0, 1000.0)) for _ in range(1000)]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def extreme_pointset():
     """Mock: Points avec coordonnées extrêmes."""
     return [
@@ -64,7 +155,7 @@ def extreme_pointset():
         (0.0, 0.0)
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def very_close_points():
     """Mock: Points très proches."""
     return [
@@ -73,7 +164,7 @@ def very_close_points():
         (2e-8, 0.0)
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def negative_coordinates_points():
     """Mock: Points avec coordonnées négatives."""
     return [
@@ -82,7 +173,7 @@ def negative_coordinates_points():
         (-75.0, 25.0)
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mixed_scale_points():
     """Mock: Points à différentes échelles."""
     return [
@@ -91,68 +182,71 @@ def mixed_scale_points():
         (500.0, 500.0)
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def flask_app():
     """Application Flask du Triangulator pour les tests."""
-    try:
-        from Triangulator.app import app
-    except ImportError:
-        from app import app
+    from Triangulator.app import app
     
-    app.config['TESTING'] = True
-    return app
-
-@pytest.fixture
+    overrides = {'TESTING': True, 'PROPAGATE_EXCEPTIONS': True, 'SERVER_NAME': 'localhost'}
+    saved = {key: app.config[key] for key in overrides}
+    app.config.update(overrides)
+    yield app
+    # configuration d'origine rétablie en fin de session
+    app.config.update(saved)
+
+@pytest.fixture(scope="session")
 def client(flask_app):
-    """Client de test Flask."""
+    """Client de test Flask (sans état entre requêtes : partagé par la session)."""
     return flask_app.test_client()
 
 @pytest.fixture
-def mock_pointset_manager():
-    """Mock du PointSetManager."""
+def patched_pm(monkeypatch):
+    """Mock du PointSetManager installé dans le module triangulator le temps du test."""
     mock = Mock()
-    mock.get_pointset.return_value = [
-        (0.0, 0.0),
-        (1.0, 0.0),
-        (0.5, 1.0)
-    ]
+    monkeypatch.setattr('Triangulator.triangulator.pointset_manager', mock)
     return mock
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_database():
     """Mock de la base de données."""
     mock = Mock()
     mock.store.return_value = "test-id-123"
-    mock.retrieve.return_value = (
-        b'\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x80?\x00\x00\x00\x00\x00\x00\x00?\x00\x00\x80?'
-    )
+    mock.retrieve.return_value = _MOCK_DB_BLOB
     return mock
 
 @pytest.fixture
 def mock_pointset_manager_with_timeout():
     """Mock du PointSetManager avec timeout."""
-    mock = Mock()
-    mock.get_pointset.side_effect = TimeoutError("Request timeout")
-    return mock
+    return FakePointSetManager(error=TimeoutError("Request timeout"))
 
 @pytest.fixture
 def mock_pointset_manager_unavailable():
     """Mock du PointSetManager indisponible."""
-    mock = Mock()
-    mock.get_pointset.side_effect = ConnectionError("Service unavailable")
-    return mock
+    return FakePointSetManager(error=ConnectionError("Service unavailable"))
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def corrupted_binary_data():
     """Mock: Données binaires corrompues."""
-    return b'\xFF\xFF\xFF\xFF' + b'\x00' * 100
+    return _CORRUPTED_BLOB
+
+@pytest.fixture
+def oversized_request_stream():
+    """Mock: Corps de 10 MB (octets 0xFF) lu à la demande, sans être alloué."""
+    return RepeatingStream(10 * 1024 * 1024)
+
+@pytest.fixture
+def oversized_pointset_stream():
+    """Mock: En-tête annonçant ~1,9 milliard de points suivi de 1 MB de zéros générés à la lecture."""
+    return RepeatingStream(4 + 1000 * 1000, fill=0, prefix=b'\x00\x0c\x42\x6f')
 
 @pytest.fixture
 def empty_binary_data():
     """Mock: Données binaires vides."""
     return b''
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def oversized_binary_data():
-    """Mock: Données binaires volumineuses."""
-    return b'\x00\x0c\x42\x6f' + b'\x00' * (50 * 1024 * 1024)
\ No newline at end of file
+    """Mock: Données binaires volumineuses (vue en lecture seule sur un buffer unique)."""
+    buffer = bytearray(4 + 50 * 1024 * 1024)
+    struct.pack_into('<I', buffer, 0, 0x6f420c00)
+    return memoryview(buffer).toreadonly()
\ No newline at end of file